@@ -3,6 +3,8 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "mcp>=1.1.2",
+#     "orjson>=3.9",
+#     "uvloop>=0.19",
 # ]
 # ///
 """
@@ -16,68 +18,208 @@ Architecture:
 """
 
 import asyncio
-import argparse
-import json
+import fcntl
+import functools
+import itertools
+import json  # stdlib json kept for the (human-edited) config file only
 import os
+import re
+import shutil
 import signal
+import socket
+import struct
 import sys
 import time
 import uuid
+from collections import deque
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Dict, Optional
 
+import orjson
+
 # State directory
 STATE_DIR = Path.home() / ".browsertools"
 CONFIG_FILE = STATE_DIR / "config.json"
 INACTIVITY_TIMEOUT = 600  # 10 minutes
+STREAM_LIMIT = 1024 * 1024 * 10  # 10MB limit for large snapshots
+SOCKET_BUF_SIZE = 256 * 1024  # Unix socket send/recv buffers
+PIPE_BUF_SIZE = 256 * 1024  # MCP stdio pipes (default 64 KiB)
+DRAIN_THRESHOLD = 64 * 1024  # only await drain() above this much buffered
+REQUEST_TIMEOUT = 30.0  # seconds to wait for an MCP response
+LISTEN_BACKLOG = 128  # accept queue; bursts of parallel CLI invocations
 
 # Global daemon state
 mcp_proc = None
 mcp_reader = None
 mcp_writer = None
-pending_requests = {}  # msg_id -> response_future
+client_conns = {}  # connection slot -> ClientConn
+request_deadlines = deque()  # (deadline, conn, local_id, future), FIFO-ordered
 last_activity_time = time.time()
 current_instance_id = None
 screenshot_count = 0
 
 
+class ClientConn:
+    """Per-connection in-flight request state.
+
+    Outbound request ids are rewritten to (slot << 32) | local_id so the MCP
+    reader can dispatch responses with two shifts and one small dict lookup,
+    and so clients can't collide with (or hijack) each other's ids.
+    """
+    __slots__ = ("slot", "futures", "local_ids")
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.futures = {}  # local_id -> (response_future, original client id)
+        self.local_ids = itertools.count(1)
+
+
+_conn_slots = itertools.count(1)
+
+# Matches the numeric tokens the daemon assigns to outbound request ids, so
+# responses can be routed without a full JSON parse of multi-MB payloads
+_TOKEN_RE = re.compile(rb'"id"\s*:\s*(\d+)')
+
+# Timeout errors all share one skeleton; splice the id in rather than
+# building and serializing a fresh dict per expiry
+_TIMEOUT_TMPL = (b'{"jsonrpc":"2.0","id":%b,'
+                 b'"error":{"code":-1,"message":"Timeout waiting for MCP response"}}')
+
+
 def generate_instance_id() -> str:
     """Generate 8-char hex instance ID."""
     return uuid.uuid4().hex[:8]
 
 
+# Linux abstract-namespace sockets (leading NUL) need no filesystem inode:
+# connect skips the VFS path walk and there is nothing stale to unlink
+USE_ABSTRACT_SOCKETS = sys.platform == "linux"
+
+
 def get_socket_path(instance_id: str) -> Path:
-    """Get socket path for instance."""
+    """Get filesystem socket path for instance (non-abstract fallback)."""
     return STATE_DIR / f"daemon-{instance_id}.sock"
 
 
+def get_socket_address(instance_id: str) -> str:
+    """Socket address for instance: abstract on Linux, STATE_DIR path elsewhere.
+
+    The uid is baked into the abstract name because that namespace is global
+    to the host (per network namespace), not per-user like STATE_DIR.
+    """
+    if USE_ABSTRACT_SOCKETS:
+        return f"\0browsertools-{os.getuid()}-{instance_id}"
+    return str(get_socket_path(instance_id))
+
+
 def get_pid_file(instance_id: str) -> Path:
     """Get PID file path for instance."""
     return STATE_DIR / f"daemon-{instance_id}.pid"
 
 
+_state_dir_ready = False
+
+
 def ensure_state_dir():
-    """Create state directory."""
-    STATE_DIR.mkdir(exist_ok=True)
+    """Create state directory (mkdir is an unconditional syscall; do it once)."""
+    global _state_dir_ready
+    if not _state_dir_ready:
+        STATE_DIR.mkdir(exist_ok=True)
+        _state_dir_ready = True
+
+
+def tune_socket(sock: Optional[socket.socket]):
+    """Enlarge socket buffers so large snapshot payloads need fewer syscalls."""
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUF_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUF_SIZE)
+    except OSError:
+        pass
+
 
+def peer_is_us(sock: socket.socket) -> bool:
+    """Check that the connecting peer runs as our uid (one getsockopt).
 
+    Filesystem sockets get this for free from STATE_DIR permissions;
+    abstract sockets have no such gate, so the daemon checks SO_PEERCRED
+    (struct ucred: pid, uid, gid) on every accept.
+    """
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                struct.calcsize("iII"))
+        _, peer_uid, _ = struct.unpack("iII", creds)
+    except OSError:
+        return False
+    return peer_uid == os.getuid()
+
+
+def grow_pipe(fd: int):
+    """Bump a pipe's kernel buffer (Linux-only; soft-capped for unprivileged users)."""
+    if not hasattr(fcntl, "F_SETPIPE_SZ"):
+        return
+    try:
+        fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, PIPE_BUF_SIZE)
+    except OSError:
+        pass
+
+
+def proc_start_time(pid: int) -> Optional[str]:
+    """Kernel start time (field 22 of /proc/<pid>/stat), or None if unavailable."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_bytes()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces; fields after the last ')' are fixed
+    return stat.rsplit(b")", 1)[1].split()[19].decode()
+
+
+@functools.lru_cache(maxsize=8)
 def get_daemon_pid(instance_id: str) -> Optional[int]:
-    """Get PID of running daemon for instance."""
+    """Get PID of running daemon for instance.
+
+    Memoized for the lifetime of the (short-lived) CLI process since it runs
+    before every command. On Linux the check is a single /proc stat, and the
+    start time recorded in the PID file guards against PID reuse; elsewhere
+    fall back to a signal-0 probe.
+    """
     pid_file = get_pid_file(instance_id)
-    if not pid_file.exists():
+    try:
+        fields = pid_file.read_text().split()
+        pid = int(fields[0])
+    except OSError:
         return None
+    except (IndexError, ValueError):
+        pid_file.unlink(missing_ok=True)
+        return None
+
+    if Path("/proc").exists():
+        current_start = proc_start_time(pid)
+        recorded_start = fields[1] if len(fields) > 1 else None
+        if current_start is None or (recorded_start and current_start != recorded_start):
+            # Dead, or the PID was recycled by an unrelated process
+            pid_file.unlink(missing_ok=True)
+            return None
+        return pid
+
     try:
-        pid = int(pid_file.read_text().strip())
         os.kill(pid, 0)  # Check if alive
         return pid
-    except (ProcessLookupError, ValueError):
+    except ProcessLookupError:
         pid_file.unlink(missing_ok=True)
         return None
 
 
 def is_daemon_running(instance_id: str) -> bool:
-    """Check if daemon is running for instance."""
-    return get_daemon_pid(instance_id) is not None and get_socket_path(instance_id).exists()
+    """Check if daemon is running for instance.
+
+    Rides get_daemon_pid's memoized pidfile read: the start-time check there
+    already proves liveness, and a missing socket surfaces as a connect
+    error anyway, so a separate socket stat buys nothing.
+    """
+    return get_daemon_pid(instance_id) is not None
 
 
 def get_all_instances() -> list[str]:
@@ -144,13 +286,50 @@ def save_default_config():
     print(f"Created config file: {CONFIG_FILE}", file=sys.stderr)
 
 
+# ============================================================================
+# WIRE FORMAT - length-prefixed frames on the client<->daemon socket
+# ============================================================================
+# chrome-devtools-mcp speaks line-delimited JSON-RPC on stdio, but on our own
+# socket a 4-byte big-endian length prefix means two readexactly() calls per
+# message instead of a byte-by-byte newline scan over multi-hundred-KB
+# snapshots. Client and daemon ship together, so the change is synchronized.
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Read one length-prefixed frame. Returns b'' on clean EOF."""
+    try:
+        header = await reader.readexactly(4)
+    except asyncio.IncompleteReadError:
+        return b""
+    return await reader.readexactly(int.from_bytes(header, "big"))
+
+
+def write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    """Write one length-prefixed frame (caller drains).
+
+    Handing the transport two buffers instead of a concatenation lets the
+    scatter-gather (sendmsg) path emit them in one syscall with no copy.
+    """
+    writer.writelines((len(payload).to_bytes(4, "big"), payload))
+
+
+async def drain_if_needed(writer: asyncio.StreamWriter):
+    """Drain only when the transport has real backpressure.
+
+    drain() costs an event-loop hop per await even when the buffer is nearly
+    empty; skipping it while the buffer is small lets pipelined writes
+    coalesce into fewer syscalls.
+    """
+    if writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+        await writer.drain()
+
+
 # ============================================================================
 # DAEMON MODE - Bridge between Unix socket and MCP stdio
 # ============================================================================
 
 async def read_mcp_responses():
-    """Read responses from MCP stdout and route to clients."""
-    global mcp_reader, pending_requests
+    """Read responses from MCP stdout and route to client connections."""
+    global mcp_reader, client_conns
 
     while True:
         try:
@@ -160,17 +339,52 @@ async def read_mcp_responses():
                 print("MCP server closed stdout", file=sys.stderr)
                 break
 
+            # Fast path: pull the token out of the raw bytes and forward the
+            # line unchanged (bar the id splice), skipping the parse+reserialize
+            # round-trip on multi-hundred-KB payloads. A candidate only counts
+            # if it resolves to an in-flight request — tokens are >= 2**32, so
+            # a lookalike inside text content falls through harmlessly.
+            routed = False
+            for match in _TOKEN_RE.finditer(line):
+                token = int(match.group(1))
+                conn = client_conns.get(token >> 32)
+                if conn is None:
+                    continue
+                entry = conn.futures.pop(token & 0xFFFFFFFF, None)
+                if entry is None:
+                    continue
+                future, original_id = entry
+                if not future.done():
+                    raw = line[:match.start(1)] + orjson.dumps(original_id) + line[match.end(1):]
+                    future.set_result(raw.rstrip(b'\n'))
+                routed = True
+                break
+            if routed:
+                continue
+
+            # Slow path: full parse (malformed fast-path miss, notifications)
             try:
-                resp = json.loads(line.decode())
-                msg_id = resp.get("id")
-
-                # Route response to waiting client
-                if msg_id and msg_id in pending_requests:
-                    future = pending_requests.pop(msg_id)
-                    future.set_result(resp)
-            except json.JSONDecodeError as e:
+                resp = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
                 print(f"Invalid JSON from MCP: {e}", file=sys.stderr)
                 print(f"Line length: {len(line)}", file=sys.stderr)
+                continue
+
+            token = resp.get("id")
+            if not isinstance(token, int):
+                continue  # notification, or a response we didn't originate
+
+            # Dispatch: high 32 bits select the connection, low 32 the request
+            conn = client_conns.get(token >> 32)
+            if conn is None:
+                continue  # client disconnected before the response arrived
+            entry = conn.futures.pop(token & 0xFFFFFFFF, None)
+            if entry is None:
+                continue  # timed out and already reaped
+            future, original_id = entry
+            resp["id"] = original_id
+            if not future.done():
+                future.set_result(resp)
 
         except Exception as e:
             print(f"Error reading MCP: {e}", file=sys.stderr)
@@ -179,68 +393,172 @@ async def read_mcp_responses():
                 break
 
 
-async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-    """Handle a client connection."""
-    global mcp_writer, pending_requests, last_activity_time, screenshot_count
+async def timeout_sweeper():
+    """Expire in-flight requests with one shared timer.
 
-    # Update activity timestamp
-    last_activity_time = time.time()
+    asyncio.wait_for schedules and cancels a call_later per request; since
+    every request uses the same timeout, the deadline deque is already sorted
+    and a single sleeping task can reap expired futures in order.
+    """
+    global request_deadlines
+    loop = asyncio.get_event_loop()
+
+    while True:
+        if not request_deadlines:
+            await asyncio.sleep(1.0)
+            continue
+        delay = request_deadlines[0][0] - loop.time()
+        if delay > 0:
+            # Wake at least once a second: completed entries still pin their
+            # futures (and the response payloads those retain) until purged,
+            # and a snapshot-sized result shouldn't live out a 30s deadline
+            await asyncio.sleep(min(delay, 1.0))
+        while request_deadlines and request_deadlines[0][3].done():
+            request_deadlines.popleft()
+        while request_deadlines and request_deadlines[0][0] <= loop.time():
+            _, conn, local_id, future = request_deadlines.popleft()
+            if not future.done():
+                conn.futures.pop(local_id, None)
+                future.set_exception(asyncio.TimeoutError())
+
+
+async def deliver_response(protocol: "DaemonProtocol", req: Dict[str, Any], conn: ClientConn,
+                           local_id: int, msg_id: Any, response_future: asyncio.Future):
+    """Await one MCP response and write it back to the client."""
+    global screenshot_count
 
     try:
-        while True:
-            # Read request from client
-            line = await reader.readline()
-            if not line:
+        resp = await response_future  # timeout_sweeper expires stragglers
+
+        # Track screenshot count (needs a parsed response to inject the note)
+        tool_name = req.get("params", {}).get("name", "")
+        if tool_name == "take_screenshot":
+            if not isinstance(resp, dict):
+                resp = orjson.loads(resp)
+            if "error" not in resp:
+                screenshot_count += 1
+                # Inject count into response text content
+                try:
+                    content = resp.get("result", {}).get("content", [])
+                    for item in content:
+                        if isinstance(item, dict) and item.get("type") == "text":
+                            item["text"] += f"\n[screenshots taken: {screenshot_count}]"
+                            break
+                except (TypeError, AttributeError):
+                    pass
+
+        if isinstance(resp, dict):
+            protocol.send_frame(orjson.dumps(resp))
+        else:
+            # Raw bytes from the fast path, forwarded without re-serializing
+            protocol.send_frame(resp)
+    except asyncio.TimeoutError:
+        protocol.send_frame(_TIMEOUT_TMPL % orjson.dumps(msg_id))
+        conn.futures.pop(local_id, None)
+
+
+class DaemonProtocol(asyncio.Protocol):
+    """Server side of a client connection, under the Streams API.
+
+    Frames are assembled directly in data_received on one bytearray, so
+    requests skip the StreamReader feeder loop and its delimiter scanning.
+    Requests may be pipelined; each response is delivered by its own task so
+    slow tools don't stall the rest of a batch.
+    """
+
+    def __init__(self):
+        self.conn = ClientConn(next(_conn_slots))
+        self.transport = None
+        self.buffer = bytearray()
+        self.response_tasks = set()
+
+    def connection_made(self, transport):
+        sock = transport.get_extra_info("socket")
+        if USE_ABSTRACT_SOCKETS and sock is not None and not peer_is_us(sock):
+            # Abstract names carry no filesystem permission bits and are
+            # enumerable via /proc/net/unix, so the uid in the name is only
+            # collision avoidance — enforce ownership on the peer itself.
+            transport.abort()
+            return
+        self.transport = transport
+        client_conns[self.conn.slot] = self.conn
+        tune_socket(sock)
+
+    def send_frame(self, payload: bytes):
+        """Write one length-prefixed frame to the client."""
+        if not self.transport.is_closing():
+            self.transport.write(len(payload).to_bytes(4, "big") + payload)
+
+    def data_received(self, data: bytes):
+        buf = self.buffer
+        buf += data
+        # Extract complete frames: 4-byte big-endian length + payload
+        offset = 0
+        while len(buf) - offset >= 4:
+            frame_len = int.from_bytes(buf[offset:offset + 4], "big")
+            if len(buf) - offset - 4 < frame_len:
                 break
+            self.handle_request(bytes(buf[offset + 4:offset + 4 + frame_len]))
+            offset += 4 + frame_len
+        if offset:
+            del buf[:offset]
 
-            try:
-                req = json.loads(line.decode())
-                msg_id = req.get("id")
-
-                # Create future for response
-                response_future = asyncio.Future()
-                pending_requests[msg_id] = response_future
+    def handle_request(self, payload: bytes):
+        global mcp_writer, last_activity_time
 
-                # Forward to MCP server
-                mcp_writer.write(line)
-                await mcp_writer.drain()
+        last_activity_time = time.time()
 
-                # Wait for response
-                try:
-                    resp = await asyncio.wait_for(response_future, timeout=30.0)
-
-                    # Track screenshot count
-                    tool_name = req.get("params", {}).get("name", "")
-                    if tool_name == "take_screenshot" and "error" not in resp:
-                        screenshot_count += 1
-                        # Inject count into response text content
-                        try:
-                            content = resp.get("result", {}).get("content", [])
-                            for item in content:
-                                if isinstance(item, dict) and item.get("type") == "text":
-                                    item["text"] += f"\n[screenshots taken: {screenshot_count}]"
-                                    break
-                        except (TypeError, AttributeError):
-                            pass
-
-                    writer.write(json.dumps(resp).encode() + b'\n')
-                    await writer.drain()
-                except asyncio.TimeoutError:
-                    writer.write(json.dumps({
-                        "jsonrpc": "2.0",
-                        "id": msg_id,
-                        "error": {"code": -1, "message": "Timeout waiting for MCP response"}
-                    }).encode() + b'\n')
-                    await writer.drain()
-                    pending_requests.pop(msg_id, None)
-
-            except json.JSONDecodeError:
-                print(f"Invalid JSON from client: {line}", file=sys.stderr)
+        try:
+            req = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            print(f"Invalid JSON from client: {payload}", file=sys.stderr)
+            return
 
-    except Exception as e:
-        print(f"Client handler error: {e}", file=sys.stderr)
-    finally:
-        writer.close()
+        # Rewrite the id to a daemon-generated token; the client's own id
+        # is restored on the way back out (see read_mcp_responses)
+        conn = self.conn
+        msg_id = req.get("id")
+        local_id = next(conn.local_ids) & 0xFFFFFFFF
+        response_future = asyncio.Future()
+        conn.futures[local_id] = (response_future, msg_id)
+        req["id"] = (conn.slot << 32) | local_id
+        request_deadlines.append(
+            (asyncio.get_event_loop().time() + REQUEST_TIMEOUT, conn, local_id, response_future))
+
+        # Forward to MCP server (line-delimited on its stdio). If its pipe is
+        # backed up, stop reading from the client until the buffer drains.
+        mcp_writer.write(orjson.dumps(req) + b'\n')
+        if mcp_writer.transport.get_write_buffer_size() > DRAIN_THRESHOLD:
+            self.transport.pause_reading()
+            self._spawn(self.resume_after_drain())
+
+        # Deliver the response out-of-band so the next pipelined request
+        # can be forwarded immediately
+        self._spawn(deliver_response(self, req, conn, local_id, msg_id, response_future))
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.response_tasks.add(task)
+        task.add_done_callback(self.response_tasks.discard)
+
+    async def resume_after_drain(self):
+        try:
+            await mcp_writer.drain()
+        finally:
+            if not self.transport.is_closing():
+                self.transport.resume_reading()
+
+    def connection_lost(self, exc):
+        if exc:
+            print(f"Client connection error: {exc}", file=sys.stderr)
+        client_conns.pop(self.conn.slot, None)
+        # Cancel leftover futures so the sweeper skips them instead of
+        # setting exceptions nobody will retrieve
+        for future, _ in self.conn.futures.values():
+            future.cancel()
+        self.conn.futures.clear()
+        for task in self.response_tasks:
+            task.cancel()
 
 
 async def shutdown_mcp():
@@ -296,12 +614,12 @@ async def run_daemon(instance_id: str):
     last_activity_time = time.time()
     ensure_state_dir()
 
-    socket_path = get_socket_path(instance_id)
+    address = get_socket_address(instance_id)
     pid_file = get_pid_file(instance_id)
 
-    # Clean up old socket if exists
-    if socket_path.exists():
-        socket_path.unlink()
+    # Clean up old socket if exists (abstract sockets vanish with the process)
+    if not USE_ABSTRACT_SOCKETS and os.path.exists(address):
+        os.unlink(address)
 
     # Load config
     config = load_config()
@@ -311,30 +629,58 @@ async def run_daemon(instance_id: str):
     print(f"Starting chrome-devtools-mcp...", file=sys.stderr)
     print(f"Command: {mcp_command} {' '.join(mcp_args)}", file=sys.stderr)
 
+    # Create the MCP stdio pipes ourselves so their kernel buffers can be
+    # enlarged: snapshot/screenshot responses run to hundreds of KB and the
+    # default 64 KiB pipe forces many small reads in read_mcp_responses
+    stdin_read, stdin_write = os.pipe()
+    stdout_read, stdout_write = os.pipe()
+    grow_pipe(stdin_write)
+    grow_pipe(stdout_read)
+
     # Start MCP server as subprocess in new process group
     # This ensures we can kill Chrome and all its children together
     mcp_proc = await asyncio.create_subprocess_exec(
         mcp_command, *mcp_args,
-        stdin=asyncio.subprocess.PIPE,
-        stdout=asyncio.subprocess.PIPE,
+        stdin=stdin_read,
+        stdout=stdout_write,
         stderr=sys.stderr,
         start_new_session=True,  # Creates new process group
-        limit=1024 * 1024 * 10,  # 10MB limit for large snapshots
     )
+    # Child owns its ends now
+    os.close(stdin_read)
+    os.close(stdout_write)
 
-    mcp_reader = mcp_proc.stdout
-    mcp_writer = mcp_proc.stdin
-
-    # Write PID file
-    pid_file.write_text(str(os.getpid()))
-
-    print(f"Starting Unix socket server at {socket_path}...", file=sys.stderr)
-
-    # Start Unix socket server
-    server = await asyncio.start_unix_server(
-        handle_client,
-        path=str(socket_path)
+    # Wire our ends of the pipes into asyncio streams
+    loop = asyncio.get_event_loop()
+    mcp_reader = asyncio.StreamReader(limit=STREAM_LIMIT, loop=loop)
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(mcp_reader, loop=loop),
+        os.fdopen(stdout_read, "rb")
+    )
+    write_transport, write_protocol = await loop.connect_write_pipe(
+        lambda: asyncio.streams.FlowControlMixin(loop=loop),
+        os.fdopen(stdin_write, "wb")
     )
+    mcp_writer = asyncio.StreamWriter(write_transport, write_protocol, None, loop)
+
+    # Write PID file (PID + kernel start time so clients can detect PID reuse)
+    start_time = proc_start_time(os.getpid())
+    pid_file.write_text(f"{os.getpid()} {start_time}" if start_time else str(os.getpid()))
+
+    print(f"Starting Unix socket server at {address!r}...", file=sys.stderr)
+
+    # Start Unix socket server (plain Protocol; framing lives in DaemonProtocol).
+    # The listening socket is built by hand so its buffers are tuned before
+    # bind — accepted sockets inherit them — and so the accept backlog covers
+    # bursts of parallel CLI invocations instead of the asyncio default.
+    # SO_REUSEPORT-style kernel accept balancing is TCP/UDP-only; for AF_UNIX
+    # a single accept queue with a deep backlog is as far as this rung goes.
+    listen_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listen_sock.setblocking(False)
+    tune_socket(listen_sock)
+    listen_sock.bind(address)
+    listen_sock.listen(LISTEN_BACKLOG)
+    server = await loop.create_unix_server(DaemonProtocol, sock=listen_sock)
 
     print(f"Daemon ready. Instance: {instance_id} PID: {os.getpid()}", file=sys.stderr)
 
@@ -354,7 +700,8 @@ async def run_daemon(instance_id: str):
         await shutdown_mcp()
         server.close()
         await server.wait_closed()
-        socket_path.unlink(missing_ok=True)
+        if not USE_ABSTRACT_SOCKETS:
+            Path(address).unlink(missing_ok=True)
         pid_file.unlink(missing_ok=True)
         # Exit cleanly instead of stopping loop (avoids RuntimeError)
         os._exit(0)
@@ -370,6 +717,7 @@ async def run_daemon(instance_id: str):
         await asyncio.gather(
             server.serve_forever(),
             read_mcp_responses(),
+            timeout_sweeper(),
             inactivity_monitor(handle_shutdown),
         )
     except KeyboardInterrupt:
@@ -380,7 +728,8 @@ async def run_daemon(instance_id: str):
             await shutdown_mcp()
             server.close()
             await server.wait_closed()
-            socket_path.unlink(missing_ok=True)
+            if not USE_ABSTRACT_SOCKETS:
+                Path(address).unlink(missing_ok=True)
             pid_file.unlink(missing_ok=True)
 
 
@@ -388,39 +737,77 @@ async def run_daemon(instance_id: str):
 # CLIENT MODE - Connect to daemon and send commands
 # ============================================================================
 
-async def send_command(instance_id: str, tool_name: str, args: Dict[str, Any]) -> Any:
-    """Send a command to the daemon via socket."""
+def send_frame(sock: socket.socket, payload: bytes):
+    """Send one length-prefixed frame via a two-buffer sendmsg (no concat copy)."""
+    header = len(payload).to_bytes(4, "big")
+    sent = sock.sendmsg((header, payload))
+    if sent < 4 + len(payload):
+        # Short send (rare for blocking stream sockets): finish the tail
+        sock.sendall((header + payload)[sent:])
+
+
+# Reused by recv_response so header reads don't allocate per call; the CLI
+# client is single-threaded
+_recv_scratch = bytearray(SOCKET_BUF_SIZE)
+
+
+def recv_response(sock: socket.socket, buf: Optional[bytearray] = None) -> Dict[str, Any]:
+    """Read one length-prefixed frame from a blocking socket and parse it.
+
+    Receives with recv_into straight into the scratch/frame buffers, so no
+    per-chunk bytes objects are allocated and large payloads land in place;
+    orjson then parses through a memoryview of the frame, skipping the
+    intermediate bytes copy a slice would make. When more frames may follow
+    on the same connection, pass the same bytearray across calls: a recv
+    can pull bytes of the next frame in with the current one, and they must
+    carry over rather than be dropped.
+    """
+    if buf is None:
+        buf = bytearray()
+    while len(buf) < 4:
+        n = sock.recv_into(_recv_scratch)
+        if not n:
+            raise RuntimeError("Daemon closed the connection")
+        buf += memoryview(_recv_scratch)[:n]
+    total = 4 + int.from_bytes(buf[:4], "big")
+    have = len(buf)
+    if have < total:
+        # Grow to the full frame size once and receive the rest in place
+        buf.extend(bytes(total - have))
+        with memoryview(buf) as view:
+            while have < total:
+                n = sock.recv_into(view[have:total])
+                if not n:
+                    raise RuntimeError("Daemon closed the connection")
+                have += n
+    with memoryview(buf) as view:
+        response = orjson.loads(view[4:total])
+    del buf[:total]
+    return response
+
+
+def connect_daemon(instance_id: str) -> socket.socket:
+    """Open a blocking client socket to a running daemon instance."""
     if not is_daemon_running(instance_id):
         raise RuntimeError(f"Daemon instance '{instance_id}' not running. Start with: browsertools.py daemon start")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    tune_socket(sock)
+    sock.connect(get_socket_address(instance_id))
+    return sock
 
-    socket_path = get_socket_path(instance_id)
 
-    # Connect to daemon's Unix socket with increased limit for large responses
-    reader, writer = await asyncio.open_unix_connection(
-        str(socket_path),
-        limit=1024 * 1024 * 10  # 10MB limit for large snapshots
-    )
+def send_command(instance_id: str, tool_name: str, args: Dict[str, Any]) -> Any:
+    """Send a command to the daemon via socket.
 
+    Synchronous on purpose: a single CLI invocation does exactly one
+    sequential round-trip, so an event loop would add setup and teardown
+    without ever overlapping anything. The daemon's timeout sweeper
+    guarantees a reply, so a plain blocking socket is all that's needed.
+    """
+    sock = connect_daemon(instance_id)
     try:
-        # Create JSON-RPC request
-        msg_id = os.urandom(8).hex()
-        request = {
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": args
-            },
-            "id": msg_id
-        }
-
-        # Send request
-        writer.write(json.dumps(request).encode() + b'\n')
-        await writer.drain()
-
-        # Read response
-        line = await reader.readline()
-        response = json.loads(line.decode())
+        send_frame(sock, build_request(tool_name, args, next_msg_id()))
+        response = recv_response(sock)
 
         if "error" in response:
             raise RuntimeError(f"MCP error: {response['error']}")
@@ -428,128 +815,362 @@ async def send_command(instance_id: str, tool_name: str, args: Dict[str, Any]) -
         return response.get("result")
 
     finally:
-        writer.close()
-        await writer.wait_closed()
+        sock.close()
+
+
+def _content_blocks(content: list):
+    """Yield printable text for each content item (text or base64 image)."""
+    for item in content:
+        if not isinstance(item, dict):
+            continue
+        if "text" in item:
+            yield item["text"]
+        elif item.get("type") == "image" and "data" in item:
+            # Base64 image data
+            yield f"\n## Base64 Image ({item.get('mimeType', 'image/png')})"
+            yield item["data"]
 
 
 def clean_output(result: Any) -> str:
-    """Extract clean text from MCP result."""
-    if isinstance(result, dict):
-        if "content" in result:
-            content = result["content"]
-            if isinstance(content, list):
-                texts = []
-                for item in content:
-                    if isinstance(item, dict):
-                        if "text" in item:
-                            texts.append(item["text"])
-                        elif item.get("type") == "image" and "data" in item:
-                            # Return base64 image data
-                            mime = item.get("mimeType", "image/png")
-                            b64_data = item["data"]
-                            texts.append(f"\n## Base64 Image ({mime})")
-                            texts.append(b64_data)
-
-                return "\n".join(texts) if texts else str(content)
-        elif "text" in result:
-            return result["text"]
-    return str(result)
-
-
-async def execute_command(instance_id: str, cmd: str, cmd_args: Dict[str, Any]):
-    """Execute a single command via daemon."""
+    """Extract clean text from MCP result, cheapest shape first."""
+    if not isinstance(result, dict):
+        return str(result)
+    if "text" in result:
+        return result["text"]
+    content = result.get("content")
+    if not isinstance(content, list):
+        return str(result)
+    # Single text block is the overwhelmingly common shape; return it
+    # without the join machinery
+    if len(content) == 1:
+        only = content[0]
+        if isinstance(only, dict) and (text := only.get("text")) is not None:
+            return text
+    return "\n".join(_content_blocks(content)) or str(content)
+
+
+# Message ids only need to be unique within one connection: the daemon
+# rewrites them to its own per-connection tokens before they reach the MCP
+# server, so a plain monotonic counter is enough — no getrandom syscall,
+# no string formatting, and numeric ids are valid JSON-RPC.
+_id_counter = itertools.count(1)
+
+
+def next_msg_id() -> int:
+    """Generate a cheap connection-unique message id."""
+    return next(_id_counter)
+
+
+# Every request shares this skeleton; only the tool name, arguments, and id
+# vary, and there are only ~18 tool names, so their JSON encodings are
+# cached and the encoder walks nothing but the arguments dict
+_RPC_TMPL = (b'{"jsonrpc":"2.0","method":"tools/call",'
+             b'"params":{"name":%b,"arguments":%b},"id":%d}')
+
+
+@functools.lru_cache(maxsize=32)
+def _tool_name_bytes(tool_name: str) -> bytes:
+    return orjson.dumps(tool_name)
+
+
+def build_request(tool_name: str, args: Dict[str, Any], msg_id: int) -> bytes:
+    """Serialize a JSON-RPC tools/call request."""
+    return _RPC_TMPL % (_tool_name_bytes(tool_name), orjson.dumps(args), msg_id)
+
+
+async def send_commands(instance_id: str, commands: list[tuple[str, Dict[str, Any]]]) -> list[Any]:
+    """Pipeline multiple (tool_name, tool_args) commands over one connection.
+
+    All requests are written up front; responses are matched by id and
+    returned in input order. Amortizes connect/close across the batch.
+    """
+    if not is_daemon_running(instance_id):
+        raise RuntimeError(f"Daemon instance '{instance_id}' not running. Start with: browsertools.py daemon start")
+
+    reader, writer = await asyncio.open_unix_connection(
+        get_socket_address(instance_id),
+        limit=STREAM_LIMIT
+    )
+    tune_socket(writer.get_extra_info("socket"))
+
+    try:
+        futures: Dict[Any, asyncio.Future] = {}
+        for tool_name, tool_args in commands:
+            msg_id = next_msg_id()
+            futures[msg_id] = asyncio.get_event_loop().create_future()
+            write_frame(writer, build_request(tool_name, tool_args, msg_id))
+            await drain_if_needed(writer)
+        await writer.drain()
+
+        async def read_responses():
+            # Any failure here (EOF mid-batch, malformed frame) must reach
+            # every unanswered future, or the gather below waits forever.
+            try:
+                for _ in range(len(futures)):
+                    payload = await read_frame(reader)
+                    if not payload:
+                        raise RuntimeError("Daemon closed the connection")
+                    response = orjson.loads(payload)
+                    future = futures.get(response.get("id"))
+                    if future and not future.done():
+                        future.set_result(response)
+            except BaseException as exc:
+                for future in futures.values():
+                    if not future.done():
+                        future.set_exception(exc)
+                raise
+
+        reader_task = asyncio.create_task(read_responses())
+        try:
+            responses = await asyncio.gather(*futures.values())
+        finally:
+            reader_task.cancel()
+            try:
+                await reader_task
+            except (Exception, asyncio.CancelledError):
+                pass
+            # The same exception is set on every unanswered future; gather
+            # propagates one, so retrieve the rest to avoid GC warnings.
+            for future in futures.values():
+                if future.done() and not future.cancelled():
+                    future.exception()
+        return responses
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
 
-    # Map commands to MCP tools
-    tool_name = None
+# CLI command -> (MCP tool name, argument spec). Each spec row is
+# (argparse attr, cmd_args key, MCP argument name, required); one table
+# drives the argparse translation in main(), batch-line parsing, and
+# tool-call construction, replacing per-command builder closures and a
+# parallel attr-mapping dict that had to be kept in sync by hand.
+COMMAND_SPECS = {
+    "nav": ("navigate_page", (
+        ("url", "url", "url", True),
+        ("timeout", "timeout", "timeout", False))),
+    "snap": ("take_snapshot", ()),
+    "click": ("click", (("uid", "uid", "uid", True),)),
+    "fill": ("fill", (
+        ("uid", "uid", "uid", True),
+        ("value", "value", "value", True))),
+    "shot": ("take_screenshot", (("path", "path", "filePath", False),)),
+    "wait": ("wait_for", (
+        ("text", "text", "text", True),
+        ("timeout", "timeout", "timeout", False))),
+    "eval": ("evaluate_script", (
+        ("function", "function", "function", True),
+        ("args", "args", "args", False))),
+    "key": ("press_key", (("key", "key", "key", True),)),
+    "hover": ("hover", (("uid", "uid", "uid", True),)),
+    "netlist": ("list_network_requests", (
+        ("types", "resource_types", "resourceTypes", False),
+        ("size", "page_size", "pageSize", False))),
+    "netget": ("get_network_request", (("reqid", "reqid", "reqid", False),)),
+    "conslist": ("list_console_messages", (
+        ("types", "types", "types", False),
+        ("size", "page_size", "pageSize", False))),
+    "consget": ("get_console_message", (("msgid", "msgid", "msgid", True),)),
+    "resize": ("resize_page", (
+        ("width", "width", "width", True),
+        ("height", "height", "height", True))),
+    "dialog": ("handle_dialog", (
+        ("action", "action", "action", True),
+        ("prompt_text", "prompt_text", "promptText", False))),
+    "upload": ("upload_file", (
+        ("uid", "uid", "uid", True),
+        ("file_path", "file_path", "filePath", True))),
+    "drag": ("drag", (
+        ("from_uid", "from_uid", "from_uid", True),
+        ("to_uid", "to_uid", "to_uid", True))),
+    "fillform": ("fill_form", (("elements", "elements", "elements", True),)),
+}
+
+
+def map_command(cmd: str, cmd_args: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
+    """Map a CLI command to its MCP tool name and arguments."""
+    try:
+        tool_name, spec = COMMAND_SPECS[cmd]
+    except KeyError:
+        raise ValueError(f"Unknown command: {cmd}") from None
     tool_args = {}
+    for _attr, src, dest, required in spec:
+        if required or src in cmd_args:
+            tool_args[dest] = cmd_args[src]
+    return tool_name, tool_args
+
+# CLI arguments that arrive as JSON strings and need parsing
+JSON_CLI_ARGS = {"args", "elements"}
+
+
+def namespace_cmd_args(args) -> Dict[str, Any]:
+    """Translate a parsed-argument namespace into cmd_args for map_command."""
+    cmd_args = {}
+    for attr, key, _dest, _required in COMMAND_SPECS[args.cmd][1]:
+        value = getattr(args, attr, None)
+        if value is None:
+            continue
+        if attr in JSON_CLI_ARGS:
+            value = orjson.loads(value)
+        cmd_args[key] = value
+    return cmd_args
+
+
+_SAVED_TO_RE = re.compile(r"Screenshot saved to (\S+)")
+
+
+def relocate_screenshot(output: str, requested: str) -> str:
+    """Move a screenshot to the requested path if the MCP saved it elsewhere.
+
+    chrome-devtools-mcp resolves filePath against its own cwd — the daemon's,
+    not the caller's — and can rewrite the name. When the paths disagree,
+    os.sendfile copies the file kernel-side instead of pulling megabytes of
+    image data through Python buffers.
+    """
+    match = _SAVED_TO_RE.search(output)
+    if not match:
+        return output
+    actual = match.group(1)
+    want = os.path.abspath(requested)
+    if os.path.abspath(actual) == want or not os.path.exists(actual):
+        return output
+    # Copy to a sibling temp name and rename into place so a failed or
+    # interrupted copy never strands a truncated file at the requested path.
+    tmp = f"{want}.tmp-{os.getpid()}"
+    try:
+        try:
+            with open(actual, "rb") as src, open(tmp, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                offset = 0
+                while remaining > 0:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+        except OSError:
+            # sendfile between regular files is Linux-only
+            shutil.copyfile(actual, tmp)
+        os.replace(tmp, want)
+        os.unlink(actual)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return output
+    return output.replace(actual, want)
 
-    if cmd == "nav":
-        tool_name = "navigate_page"
-        tool_args = {"url": cmd_args["url"]}
-        if "timeout" in cmd_args:
-            tool_args["timeout"] = cmd_args["timeout"]
-    elif cmd == "snap":
-        tool_name = "take_snapshot"
-    elif cmd == "click":
-        tool_name = "click"
-        tool_args = {"uid": cmd_args["uid"]}
-    elif cmd == "fill":
-        tool_name = "fill"
-        tool_args = {"uid": cmd_args["uid"], "value": cmd_args["value"]}
-    elif cmd == "shot":
-        tool_name = "take_screenshot"
-        if "path" in cmd_args:
-            tool_args["filePath"] = cmd_args["path"]
-    elif cmd == "wait":
-        tool_name = "wait_for"
-        tool_args = {"text": cmd_args["text"]}
-        if "timeout" in cmd_args:
-            tool_args["timeout"] = cmd_args["timeout"]
-    elif cmd == "eval":
-        tool_name = "evaluate_script"
-        tool_args = {"function": cmd_args["function"]}
-        if "args" in cmd_args:
-            tool_args["args"] = cmd_args["args"]
-    elif cmd == "key":
-        tool_name = "press_key"
-        tool_args = {"key": cmd_args["key"]}
-    elif cmd == "hover":
-        tool_name = "hover"
-        tool_args = {"uid": cmd_args["uid"]}
-    elif cmd == "netlist":
-        tool_name = "list_network_requests"
-        if "resource_types" in cmd_args:
-            tool_args["resourceTypes"] = cmd_args["resource_types"]
-        if "page_size" in cmd_args:
-            tool_args["pageSize"] = cmd_args["page_size"]
-    elif cmd == "netget":
-        tool_name = "get_network_request"
-        if "reqid" in cmd_args:
-            tool_args["reqid"] = cmd_args["reqid"]
-    elif cmd == "conslist":
-        tool_name = "list_console_messages"
-        if "types" in cmd_args:
-            tool_args["types"] = cmd_args["types"]
-        if "page_size" in cmd_args:
-            tool_args["pageSize"] = cmd_args["page_size"]
-    elif cmd == "consget":
-        tool_name = "get_console_message"
-        tool_args = {"msgid": cmd_args["msgid"]}
-    elif cmd == "resize":
-        tool_name = "resize_page"
-        tool_args = {"width": cmd_args["width"], "height": cmd_args["height"]}
-    elif cmd == "dialog":
-        tool_name = "handle_dialog"
-        tool_args = {"action": cmd_args["action"]}
-        if "prompt_text" in cmd_args:
-            tool_args["promptText"] = cmd_args["prompt_text"]
-    elif cmd == "upload":
-        tool_name = "upload_file"
-        tool_args = {"uid": cmd_args["uid"], "filePath": cmd_args["file_path"]}
-    elif cmd == "drag":
-        tool_name = "drag"
-        tool_args = {"from_uid": cmd_args["from_uid"], "to_uid": cmd_args["to_uid"]}
-    elif cmd == "fillform":
-        tool_name = "fill_form"
-        tool_args = {"elements": cmd_args["elements"]}
-    else:
-        raise ValueError(f"Unknown command: {cmd}")
+
+def execute_command(instance_id: str, cmd: str, cmd_args: Dict[str, Any]):
+    """Execute a single command via daemon."""
+    tool_name, tool_args = map_command(cmd, cmd_args)
 
     # Send to daemon
-    result = await send_command(instance_id, tool_name, tool_args)
-    return clean_output(result)
+    result = send_command(instance_id, tool_name, tool_args)
+    output = clean_output(result)
+    if cmd == "shot" and cmd_args.get("path"):
+        output = relocate_screenshot(output, cmd_args["path"])
+    return output
+
+
+async def execute_batch(instance_id: str, stream) -> int:
+    """Execute newline-delimited JSON commands from a stream over one connection.
+
+    Each line is {"cmd": "<cli command>", "args": {...}}. Prints one result
+    block per command in input order. Returns the number of failed commands.
+    """
+    commands = []
+    for raw in stream:
+        raw = raw.strip()
+        if not raw:
+            continue
+        spec = orjson.loads(raw)
+        commands.append(map_command(spec["cmd"], spec.get("args", {})))
+
+    if not commands:
+        return 0
+
+    failures = 0
+    responses = await send_commands(instance_id, commands)
+    for (tool_name, _), response in zip(commands, responses):
+        if "error" in response:
+            failures += 1
+            print(f"Error ({tool_name}): {response['error']}", file=sys.stderr)
+        else:
+            print(clean_output(response.get("result")))
+    return failures
+
+
+def print_response(name: str, response: Dict[str, Any]) -> int:
+    """Print one command's result (or its error); returns 1 on failure."""
+    if "error" in response:
+        print(f"Error ({name}): {response['error']}", file=sys.stderr)
+        return 1
+    print(clean_output(response.get("result")), flush=True)
+    return 0
+
+
+def execute_shell(instance_id: str, stream, sequential: bool = False) -> int:
+    """Run CLI-style command lines from a stream over one connection.
+
+    Each line reads exactly as it would on the command line, e.g.
+    'click 1_23' or 'fill 1_7 "two words"'. Piped input is pipelined:
+    every request is written before the first response is read, and
+    results print in input order once replies arrive — the daemon
+    forwards requests in order over the MCP's serial stdio, so the
+    semantics match lock-step without paying (N-1) round-trip stalls.
+    Interactive sessions and --sequential stay lock-step so each result
+    prints as its command completes. Returns the number of failed lines.
+    """
+    import shlex
+
+    sock = connect_daemon(instance_id)
+    lockstep = sequential or stream.isatty()
+    failures = 0
+    sent = []  # (CLI command name, msg_id) in input order
+    recv_buf = bytearray()  # carries partial/extra frames between reads
+    try:
+        for raw in stream:
+            tokens = shlex.split(raw, comments=True)
+            if not tokens:
+                continue
+            parsed = fast_parse(tokens)
+            if parsed is None or parsed.cmd not in COMMAND_SPECS:
+                failures += 1
+                print(f"Error: unrecognized command: {raw.strip()}", file=sys.stderr)
+                continue
+            try:
+                tool_name, tool_args = map_command(parsed.cmd, namespace_cmd_args(parsed))
+            except Exception as e:
+                failures += 1
+                print(f"Error ({tokens[0]}): {e}", file=sys.stderr)
+                continue
+            msg_id = next_msg_id()
+            send_frame(sock, build_request(tool_name, tool_args, msg_id))
+            if lockstep:
+                failures += print_response(tokens[0], recv_response(sock, recv_buf))
+            else:
+                sent.append((tokens[0], msg_id))
+
+        if sent:
+            responses = {}
+            for _ in sent:
+                response = recv_response(sock, recv_buf)
+                responses[response.get("id")] = response
+            for name, msg_id in sent:
+                failures += print_response(
+                    name, responses.get(msg_id, {"error": "no response from daemon"}))
+    finally:
+        sock.close()
+    return failures
 
 
 # ============================================================================
 # CLI INTERFACE
 # ============================================================================
 
-async def main():
-    parser = argparse.ArgumentParser(
-        prog="browsertools.py",
-        description="Chrome DevTools MCP wrapper - multi-instance daemon mode",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=r"""
+EPILOG = r"""
 browsertools.py - Chrome DevTools automation tool
 
 Usage: uv run .agents/tools/chrome-devtools/browsertools.py <command>
@@ -595,6 +1216,12 @@ PAGE MANIPULATION:
   dialog <action>       Handle alert/confirm/prompt (accept|dismiss)
   upload <uid> <path>   Upload file
 
+BATCHING:
+  batch <file|->        Pipeline many commands over one connection
+                        One JSON per line: {"cmd":"click","args":{"uid":"1_2"}}
+  shell                 Run CLI-style lines from stdin over one connection
+                        e.g. printf 'nav http://x\nsnap\nclick 1_2\n' | ... shell
+
 USAGE TIPS:
 **Snapshots** are verbose. Always try to pipe grep first
     # Orientation snap (what can I interact with?)                                                                                                                                                                                                 
@@ -624,14 +1251,87 @@ EXAMPLES:
   # Stop when finished to clean up resources
   uv run .agents/tools/chrome-devtools/browsertools.py daemon stop a3f7b2c1
         """
-    )
-
-    # Global --instance argument
-    parser.add_argument("--instance", "-i", help="Daemon instance ID (required for browser commands)")
 
-    subparsers = parser.add_subparsers(dest="cmd", required=True)
+# Subparser definitions: help text plus add_argument specs. Building all ~20
+# subparsers allocates hundreds of objects on every invocation, so the parser
+# is assembled from this table — normally only for the one command requested.
+CLI_SUBCOMMANDS = {
+    "nav": ("Navigate to URL", [
+        ("url", {"help": "URL to navigate to"}),
+        ("--timeout", {"type": int, "default": 30000, "help": "Max wait time in milliseconds"}),
+    ]),
+    "snap": ("Take page snapshot", []),
+    "shot": ("Take screenshot", [
+        ("path", {"nargs": "?", "help": "Save path (optional)"}),
+    ]),
+    "click": ("Click element", [
+        ("uid", {"help": "Element UID from snapshot"}),
+    ]),
+    "fill": ("Fill input", [
+        ("uid", {"help": "Element UID"}),
+        ("value", {"help": "Value to fill"}),
+    ]),
+    "wait": ("Wait for text", [
+        ("text", {"help": "Text to wait for"}),
+        ("--timeout", {"type": int, "help": "Max wait time in milliseconds"}),
+    ]),
+    "eval": ("Execute JavaScript", [
+        ("function", {"help": "JS function to execute"}),
+        ("--args", {"help": "JSON array of element UIDs to pass as arguments"}),
+    ]),
+    "key": ("Press keyboard key", [
+        ("key", {"help": "Key to press (e.g., 'Enter', 'Tab', 'Escape')"}),
+    ]),
+    "hover": ("Hover over element", [
+        ("uid", {"help": "Element UID from snapshot"}),
+    ]),
+    "netlist": ("List network requests", [
+        ("--types", {"nargs": "+", "help": "Filter by resource types"}),
+        ("--size", {"type": int, "help": "Max requests to return"}),
+    ]),
+    "netget": ("Get network request details", [
+        ("reqid", {"nargs": "?", "type": int, "help": "Request ID (omit for latest)"}),
+    ]),
+    "conslist": ("List console messages", [
+        ("--types", {"nargs": "+", "help": "Filter by types (log, error, warn)"}),
+        ("--size", {"type": int, "help": "Max messages to return"}),
+    ]),
+    "consget": ("Get console message details", [
+        ("msgid", {"type": int, "help": "Message ID"}),
+    ]),
+    "resize": ("Resize page viewport", [
+        ("width", {"type": int, "help": "Width in pixels"}),
+        ("height", {"type": int, "help": "Height in pixels"}),
+    ]),
+    "dialog": ("Handle browser dialog (alert/confirm/prompt)", [
+        ("action", {"choices": ["accept", "dismiss"], "help": "Accept or dismiss dialog"}),
+        ("--text", {"dest": "prompt_text", "help": "Text for prompt dialog"}),
+    ]),
+    "upload": ("Upload file through element", [
+        ("uid", {"help": "File input element UID"}),
+        ("file_path", {"help": "Local file path to upload"}),
+    ]),
+    "drag": ("Drag element to target", [
+        ("from_uid", {"help": "Source element UID"}),
+        ("to_uid", {"help": "Target element UID"}),
+    ]),
+    "fillform": ("Fill multiple form fields", [
+        ("elements", {"help": "JSON array: [{'uid':'1_1','value':'text'}]"}),
+    ]),
+    "batch": ("Pipeline commands from a file over one connection", [
+        ("source", {"help": "File of newline-delimited JSON commands, or '-' for stdin"}),
+    ]),
+    "shell": ("Run CLI-style command lines from stdin over one connection", [
+        ("--sequential", {"action": "store_true",
+                          "help": "Wait for each response before sending the next command"}),
+    ]),
+}
+
+
+def add_daemon_subparser(subparsers):
+    """The daemon command has its own nested subcommands."""
+    import argparse
 
-    # Daemon management
     daemon = subparsers.add_parser("daemon", help="Manage daemon")
     daemon_sub = daemon.add_subparsers(dest="daemon_cmd", required=True)
     daemon_sub.add_parser("start", help="Start new daemon instance (returns instance ID)")
@@ -640,76 +1340,152 @@ EXAMPLES:
     stop_parser.add_argument("--all", dest="stop_all", action="store_true", help=argparse.SUPPRESS)  # Hidden
     daemon_sub.add_parser("config", help="Create default config file")
 
-    # Browser commands
-    nav = subparsers.add_parser("nav", help="Navigate to URL")
-    nav.add_argument("url", help="URL to navigate to")
-    nav.add_argument("--timeout", type=int, default=30000, help="Max wait time in milliseconds")
-
-    subparsers.add_parser("snap", help="Take page snapshot")
-
-    shot = subparsers.add_parser("shot", help="Take screenshot")
-    shot.add_argument("path", nargs="?", help="Save path (optional)")
-
-    click = subparsers.add_parser("click", help="Click element")
-    click.add_argument("uid", help="Element UID from snapshot")
-
-    fill = subparsers.add_parser("fill", help="Fill input")
-    fill.add_argument("uid", help="Element UID")
-    fill.add_argument("value", help="Value to fill")
-
-    wait = subparsers.add_parser("wait", help="Wait for text")
-    wait.add_argument("text", help="Text to wait for")
-    wait.add_argument("--timeout", type=int, help="Max wait time in milliseconds")
-
-    eval_parser = subparsers.add_parser("eval", help="Execute JavaScript")
-    eval_parser.add_argument("function", help="JS function to execute")
-    eval_parser.add_argument("--args", help="JSON array of element UIDs to pass as arguments")
-
-    # Keyboard & mouse
-    key = subparsers.add_parser("key", help="Press keyboard key")
-    key.add_argument("key", help="Key to press (e.g., 'Enter', 'Tab', 'Escape')")
-
-    hover_parser = subparsers.add_parser("hover", help="Hover over element")
-    hover_parser.add_argument("uid", help="Element UID from snapshot")
-
-    # Network debugging
-    netlist = subparsers.add_parser("netlist", help="List network requests")
-    netlist.add_argument("--types", nargs="+", help="Filter by resource types")
-    netlist.add_argument("--size", type=int, help="Max requests to return")
 
-    netget = subparsers.add_parser("netget", help="Get network request details")
-    netget.add_argument("reqid", nargs="?", type=int, help="Request ID (omit for latest)")
+@functools.lru_cache(maxsize=2)
+def build_parser(only: Optional[str] = None) -> "argparse.ArgumentParser":
+    """Build the CLI parser (memoized per `only` shape).
 
-    # Console debugging
-    conslist = subparsers.add_parser("conslist", help="List console messages")
-    conslist.add_argument("--types", nargs="+", help="Filter by types (log, error, warn)")
-    conslist.add_argument("--size", type=int, help="Max messages to return")
+    When `only` names a known command, just that one subparser is
+    constructed; --help and unknown commands pay for the full tree.
+    argparse itself is imported here so the fast_parse path never loads it.
+    """
+    import argparse
 
-    consget = subparsers.add_parser("consget", help="Get console message details")
-    consget.add_argument("msgid", type=int, help="Message ID")
-
-    # Page manipulation
-    resize = subparsers.add_parser("resize", help="Resize page viewport")
-    resize.add_argument("width", type=int, help="Width in pixels")
-    resize.add_argument("height", type=int, help="Height in pixels")
+    parser = argparse.ArgumentParser(
+        prog="browsertools.py",
+        description="Chrome DevTools MCP wrapper - multi-instance daemon mode",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=EPILOG if only is None else None,
+    )
 
-    dialog = subparsers.add_parser("dialog", help="Handle browser dialog (alert/confirm/prompt)")
-    dialog.add_argument("action", choices=["accept", "dismiss"], help="Accept or dismiss dialog")
-    dialog.add_argument("--text", dest="prompt_text", help="Text for prompt dialog")
+    # Global --instance argument
+    parser.add_argument("--instance", "-i", help="Daemon instance ID (required for browser commands)")
 
-    upload = subparsers.add_parser("upload", help="Upload file through element")
-    upload.add_argument("uid", help="File input element UID")
-    upload.add_argument("file_path", help="Local file path to upload")
+    subparsers = parser.add_subparsers(dest="cmd", required=True)
 
-    # Advanced interaction
-    drag_parser = subparsers.add_parser("drag", help="Drag element to target")
-    drag_parser.add_argument("from_uid", help="Source element UID")
-    drag_parser.add_argument("to_uid", help="Target element UID")
+    if only is None or only == "daemon":
+        add_daemon_subparser(subparsers)
+    for name, (help_text, arg_specs) in CLI_SUBCOMMANDS.items():
+        if only is not None and name != only:
+            continue
+        sub = subparsers.add_parser(name, help=help_text)
+        for arg_name, kwargs in arg_specs:
+            sub.add_argument(arg_name, **kwargs)
+
+    return parser
+
+
+def peek_command(argv: list[str]) -> Optional[str]:
+    """Find the subcommand token without a full parse.
+
+    None means build the whole tree: a help request, an unrecognized
+    command (so argparse can list the choices), or no command at all.
+    """
+    i = 0
+    while i < len(argv):
+        tok = argv[i]
+        if tok in ("--instance", "-i"):
+            i += 2
+            continue
+        if tok.startswith("--instance="):
+            i += 1
+            continue
+        if tok.startswith("-"):
+            return None  # -h/--help, or junk for argparse to reject
+        return tok if (tok in CLI_SUBCOMMANDS or tok == "daemon") else None
+    return None
+
+
+def fast_parse(argv: list[str]) -> Optional[SimpleNamespace]:
+    """Parse a plain browser-command invocation without touching argparse.
+
+    Interprets the same CLI_SUBCOMMANDS specs argparse would be built from,
+    so the grammar cannot drift. Anything this doesn't recognize — help,
+    daemon management, bad values, unknown flags — returns None and falls
+    back to a real argparse parse for proper diagnostics.
+    """
+    ns = SimpleNamespace(instance=None)
+    i = 0
+    while i < len(argv):
+        tok = argv[i]
+        if tok in ("--instance", "-i") and i + 1 < len(argv):
+            ns.instance = argv[i + 1]
+            i += 2
+        elif tok.startswith("--instance="):
+            ns.instance = tok.partition("=")[2]
+            i += 1
+        else:
+            break
+    if i >= len(argv) or argv[i] not in CLI_SUBCOMMANDS:
+        return None
 
-    fillform_parser = subparsers.add_parser("fillform", help="Fill multiple form fields")
-    fillform_parser.add_argument("elements", help="JSON array: [{'uid':'1_1','value':'text'}]")
+    cmd = argv[i]
+    specs = CLI_SUBCOMMANDS[cmd][1]
+    options = {}
+    positionals = []
+    for name, kwargs in specs:
+        if name.startswith("-"):
+            options[name] = kwargs
+        else:
+            positionals.append((name, kwargs))
+        setattr(ns, kwargs.get("dest", name.lstrip("-")), kwargs.get("default"))
 
-    args = parser.parse_args()
+    pos_index = 0
+    rest = argv[i + 1:]
+    j = 0
+    try:
+        while j < len(rest):
+            tok = rest[j]
+            if tok.startswith("--"):
+                name, sep, value = tok.partition("=")
+                if not sep:
+                    j += 1
+                    if j >= len(rest):
+                        return None
+                    value = rest[j]
+                kwargs = options.get(name)
+                if kwargs is None or kwargs.get("action"):
+                    return None
+                convert = kwargs.get("type", str)
+                if kwargs.get("nargs") == "+":
+                    values = [convert(value)]
+                    while j + 1 < len(rest) and not rest[j + 1].startswith("-"):
+                        j += 1
+                        values.append(convert(rest[j]))
+                    value = values
+                else:
+                    value = convert(value)
+                setattr(ns, kwargs.get("dest", name[2:]), value)
+            elif tok.startswith("-") and len(tok) > 1:
+                return None  # -h or a flag we don't model
+            else:
+                if pos_index >= len(positionals):
+                    return None
+                name, kwargs = positionals[pos_index]
+                pos_index += 1
+                choices = kwargs.get("choices")
+                if choices and tok not in choices:
+                    return None
+                setattr(ns, name, kwargs.get("type", str)(tok))
+            j += 1
+    except ValueError:
+        return None  # bad int etc.; argparse will print the real error
+
+    # Unfilled positionals are fine only if optional
+    for name, kwargs in positionals[pos_index:]:
+        if kwargs.get("nargs") != "?":
+            return None
+
+    ns.cmd = cmd
+    return ns
+
+
+def main():
+    # Common browser commands skip argparse entirely; everything else
+    # (help, daemon management, malformed input) takes the full parser
+    args = fast_parse(sys.argv[1:])
+    if args is None:
+        args = build_parser(peek_command(sys.argv[1:])).parse_args()
 
     # Handle daemon commands
     if args.cmd == "daemon":
@@ -725,7 +1501,7 @@ EXAMPLES:
                 # Give child a moment to start
                 time.sleep(0.5)
                 print(f"browsertools daemon started. Instance ID: {instance_id}")
-                return  # Exit from async main, let asyncio.run() clean up
+                return
             else:
                 # Child process - detach and run daemon
                 os.setsid()  # Create new session, detach from terminal
@@ -739,10 +1515,13 @@ EXAMPLES:
                 os.close(devnull_r)
                 os.close(devnull_w)
 
-                # Create fresh event loop for child (parent's loop is unusable after fork)
-                asyncio.set_event_loop(asyncio.new_event_loop())
+                # uvloop is a drop-in replacement for the selector loop; the
+                # daemon is a pure socket/subprocess bridge, exactly the
+                # workload it accelerates. Only the daemon pays the import.
+                import uvloop
+                uvloop.install()
 
-                # Run the daemon in the new event loop (this blocks until shutdown)
+                # Run the daemon (this blocks until shutdown)
                 asyncio.run(run_daemon(instance_id))
                 os._exit(0)
 
@@ -789,64 +1568,30 @@ EXAMPLES:
         print(f"Error: Instance '{args.instance}' is not running", file=sys.stderr)
         sys.exit(1)
 
+    if args.cmd == "batch":
+        # Batch mode keeps asyncio: pipelined requests genuinely overlap
+        try:
+            if args.source == "-":
+                failures = asyncio.run(execute_batch(args.instance, sys.stdin))
+            else:
+                with open(args.source) as f:
+                    failures = asyncio.run(execute_batch(args.instance, f))
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
+    if args.cmd == "shell":
+        try:
+            failures = execute_shell(args.instance, sys.stdin,
+                                     sequential=bool(getattr(args, "sequential", False)))
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(1 if failures else 0)
+
     try:
-        cmd_args_dict = {}
-
-        if args.cmd == "nav":
-            cmd_args_dict["url"] = args.url
-            if args.timeout:
-                cmd_args_dict["timeout"] = args.timeout
-        elif args.cmd == "click":
-            cmd_args_dict["uid"] = args.uid
-        elif args.cmd == "fill":
-            cmd_args_dict["uid"] = args.uid
-            cmd_args_dict["value"] = args.value
-        elif args.cmd == "shot" and args.path:
-            cmd_args_dict["path"] = args.path
-        elif args.cmd == "wait":
-            cmd_args_dict["text"] = args.text
-            if args.timeout:
-                cmd_args_dict["timeout"] = args.timeout
-        elif args.cmd == "eval":
-            cmd_args_dict["function"] = args.function
-            if args.args:
-                cmd_args_dict["args"] = json.loads(args.args)
-        elif args.cmd == "key":
-            cmd_args_dict["key"] = args.key
-        elif args.cmd == "hover":
-            cmd_args_dict["uid"] = args.uid
-        elif args.cmd == "netlist":
-            if args.types:
-                cmd_args_dict["resource_types"] = args.types
-            if args.size:
-                cmd_args_dict["page_size"] = args.size
-        elif args.cmd == "netget":
-            if args.reqid:
-                cmd_args_dict["reqid"] = args.reqid
-        elif args.cmd == "conslist":
-            if args.types:
-                cmd_args_dict["types"] = args.types
-            if args.size:
-                cmd_args_dict["page_size"] = args.size
-        elif args.cmd == "consget":
-            cmd_args_dict["msgid"] = args.msgid
-        elif args.cmd == "resize":
-            cmd_args_dict["width"] = args.width
-            cmd_args_dict["height"] = args.height
-        elif args.cmd == "dialog":
-            cmd_args_dict["action"] = args.action
-            if args.prompt_text:
-                cmd_args_dict["prompt_text"] = args.prompt_text
-        elif args.cmd == "upload":
-            cmd_args_dict["uid"] = args.uid
-            cmd_args_dict["file_path"] = args.file_path
-        elif args.cmd == "drag":
-            cmd_args_dict["from_uid"] = args.from_uid
-            cmd_args_dict["to_uid"] = args.to_uid
-        elif args.cmd == "fillform":
-            cmd_args_dict["elements"] = json.loads(args.elements)
-
-        output = await execute_command(args.instance, args.cmd, cmd_args_dict)
+        output = execute_command(args.instance, args.cmd, namespace_cmd_args(args))
         print(output)
 
     except Exception as e:
@@ -855,4 +1600,4 @@ EXAMPLES:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()